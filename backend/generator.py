@@ -1,21 +1,31 @@
-import random
+import numpy as np
+from grid_tables import BOX_OF, UNITS
 from solver import SudokuSolver
 
+DIFFICULTIES = ("easy", "medium", "hard")
+
 class SudokuGenerator:
     """
     A Sudoku puzzle generator that creates valid puzzles with unique solutions.
     """
     
-    def __init__(self):
-        self.solver = SudokuSolver()
+    def __init__(self, solver: SudokuSolver = None):
+        # Share the caller's solver when given, so its matrix and kernels are built once
+        self.solver = solver if solver is not None else SudokuSolver()
         self.size = 9
         self.box_size = 3
+        
+        # Reusable digit template and box cell indices for _fill_box, and the
+        # PCG64 generator behind every random choice this instance makes
+        self._digits = np.arange(1, self.size + 1, dtype=np.int8)
+        self._rng = np.random.default_rng()
+        self._box_cells = [np.array(UNITS[2 * self.size + box]) for box in range(self.size)]
     
-    def generate_complete_sudoku(self) -> list:
+    def generate_complete_sudoku(self) -> np.ndarray:
         """
-        Generate a complete, solved Sudoku grid.
+        Generate a complete, solved Sudoku grid as a flat int8 array of 81 cells.
         """
-        grid = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        grid = np.zeros(self.size * self.size, dtype=np.int8)
         
         # Fill diagonal 3x3 boxes first (they are independent)
         self._fill_diagonal_boxes(grid)
@@ -25,25 +35,21 @@ class SudokuGenerator:
         
         return grid
     
-    def _fill_diagonal_boxes(self, grid: list):
+    def _fill_diagonal_boxes(self, grid: np.ndarray):
         """
         Fill the three diagonal 3x3 boxes with random valid numbers.
         """
         for box in range(0, self.size, self.box_size):
             self._fill_box(grid, box, box)
     
-    def _fill_box(self, grid: list, row: int, col: int):
+    def _fill_box(self, grid: np.ndarray, row: int, col: int):
         """
         Fill a 3x3 box with random valid numbers.
         """
-        numbers = list(range(1, 10))
-        random.shuffle(numbers)
-        
-        for i in range(self.box_size):
-            for j in range(self.box_size):
-                grid[row + i][col + j] = numbers[i * self.box_size + j]
+        box = BOX_OF[row * self.size + col]
+        grid[self._box_cells[box]] = self._rng.permutation(self._digits)
     
-    def generate_puzzle(self, difficulty: str = "medium") -> list:
+    def generate_puzzle(self, difficulty: str = "medium") -> np.ndarray:
         """
         Generate a Sudoku puzzle by removing numbers from a complete grid.
         
@@ -51,67 +57,90 @@ class SudokuGenerator:
             difficulty: "easy", "medium", or "hard"
         
         Returns:
-            A 9x9 grid with some cells filled (0s represent empty cells)
+            A flat array of 81 cells with some filled (0s represent empty cells)
         """
         # Generate a complete Sudoku first
         complete_grid = self.generate_complete_sudoku()
         
         # Determine how many cells to remove based on difficulty
         if difficulty == "easy":
-            cells_to_remove = random.randint(35, 45)  # 35-45 empty cells
+            cells_to_remove = self._rng.integers(35, 45, endpoint=True)  # 35-45 empty cells
         elif difficulty == "medium":
-            cells_to_remove = random.randint(46, 55)  # 46-55 empty cells
+            cells_to_remove = self._rng.integers(46, 55, endpoint=True)  # 46-55 empty cells
         else:  # hard
-            cells_to_remove = random.randint(56, 64)  # 56-64 empty cells
+            cells_to_remove = self._rng.integers(56, 64, endpoint=True)  # 56-64 empty cells
         
         # Create a puzzle by removing cells
         puzzle = self._create_puzzle(complete_grid, cells_to_remove)
         
         return puzzle
     
-    def _create_puzzle(self, complete_grid: list, cells_to_remove: int) -> list:
+    def _create_puzzle(self, complete_grid: np.ndarray, cells_to_remove: int) -> np.ndarray:
         """
         Create a puzzle by removing cells while ensuring a unique solution.
+        Cells are removed in 180-degree symmetric pairs where possible.
         """
         # Make a copy of the complete grid
-        puzzle = [row[:] for row in complete_grid]
-        
-        # Get all cell positions
-        positions = [(i, j) for i in range(self.size) for j in range(self.size)]
-        random.shuffle(positions)
+        puzzle = complete_grid.copy()
         
         removed_count = 0
         
-        for row, col in positions:
+        for cells in self._removal_groups():
             if removed_count >= cells_to_remove:
                 break
             
-            # Store the original value
-            original_value = puzzle[row][col]
+            # Skip pairs that would overshoot the target, and cells already removed
+            if removed_count + len(cells) > cells_to_remove or not puzzle[cells].all():
+                continue
             
-            # Remove the cell
-            puzzle[row][col] = 0
+            # Store the original values
+            original_values = puzzle[cells]
+            
+            # Remove the cells
+            puzzle[cells] = 0
             
             # Check if the puzzle still has a unique solution
             if self._has_unique_solution(puzzle):
-                removed_count += 1
+                removed_count += len(cells)
             else:
-                # Restore the cell if it breaks uniqueness
-                puzzle[row][col] = original_value
+                # Restore the cells if they break uniqueness
+                puzzle[cells] = original_values
         
         return puzzle
     
-    def _has_unique_solution(self, grid: list) -> bool:
+    def _removal_groups(self):
+        """
+        Yield the cell groups _create_puzzle tries to remove: every 180-degree
+        symmetric pair (and the centre cell) in random order, then every single
+        cell in random order. The single cells top up an odd target, or one the
+        pairs alone could not reach while keeping the solution unique.
+        """
+        last = self.size * self.size - 1
+        
+        # Visit the first half of the cells (up to the centre) in random order;
+        # each stands for itself and its mirror through the centre
+        for idx in self._rng.permutation(last // 2 + 1):
+            mirror = last - idx
+            yield [idx, mirror] if mirror != idx else [idx]
+        
+        for idx in self._rng.permutation(last + 1):
+            yield [idx]
+    
+    def _has_unique_solution(self, grid: np.ndarray) -> bool:
         """
         Check if the puzzle has exactly one solution.
         """
         solutions_count = self.solver.count_solutions(grid, limit=2)
         return solutions_count == 1
     
-    def get_random_puzzle(self) -> list:
+    def get_random_puzzle(self) -> np.ndarray:
         """
         Generate a random difficulty puzzle.
         """
-        difficulties = ["easy", "medium", "hard"]
-        difficulty = random.choice(difficulties)
-        return self.generate_puzzle(difficulty)
+        return self.generate_puzzle(self.random_difficulty())
+    
+    def random_difficulty(self) -> str:
+        """
+        Pick one of DIFFICULTIES uniformly at random.
+        """
+        return DIFFICULTIES[self._rng.integers(len(DIFFICULTIES))]
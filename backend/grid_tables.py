@@ -0,0 +1,14 @@
+# Index tables shared by SudokuSolver and its Numba kernels, built once here
+# so the two can't drift apart. Cells are numbered 9 * row + col.
+
+# Row, column and box of every cell index
+ROW_OF = tuple(idx // 9 for idx in range(81))
+COL_OF = tuple(idx % 9 for idx in range(81))
+BOX_OF = tuple(3 * (idx // 27) + (idx % 9) // 3 for idx in range(81))
+
+# Cell indices of the 27 units: rows 0-8, columns 9-17 and boxes 18-26
+UNITS = (
+    tuple(tuple(idx for idx in range(81) if ROW_OF[idx] == row) for row in range(9))
+    + tuple(tuple(idx for idx in range(81) if COL_OF[idx] == col) for col in range(9))
+    + tuple(tuple(idx for idx in range(81) if BOX_OF[idx] == box) for box in range(9))
+)
@@ -1,7 +1,11 @@
 from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import logging
+import numpy as np
 import sys
 import os
 
@@ -9,18 +13,81 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from solver import SudokuSolver
-from generator import SudokuGenerator
+from generator import SudokuGenerator, DIFFICULTIES
 
-app = FastAPI(title="Sudoku API", version="1.0.0")
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="Sudoku API", version="1.0.0", default_response_class=ORJSONResponse)
+
+# Built once and shared: construction compiles the solver kernels
+SOLVER = SudokuSolver()
+GENERATOR = SudokuGenerator(solver=SOLVER)
+
+# Solving and generating are CPU-bound, so run them off the event loop.
+# The Numba kernels release the GIL, letting workers use separate cores.
+SOLVER_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Pre-generated puzzles per difficulty, kept topped up in the background.
+# Refills share one worker of their own so they never queue ahead of
+# interactive requests on SOLVER_POOL.
+PUZZLE_POOL_SIZE = 16
+PUZZLE_FILL_POOL = ThreadPoolExecutor(max_workers=1)
+PUZZLE_QUEUES = {}
+PUZZLE_FILLERS = []
+PUZZLE_RETRY_DELAY = 1.0  # seconds to wait after a failed background generation
+
+# Known-valid puzzle served if direct generation fails
+FALLBACK_PUZZLE = [
+    [5, 3, 0, 0, 7, 0, 0, 0, 0],
+    [6, 0, 0, 1, 9, 5, 0, 0, 0],
+    [0, 9, 8, 0, 0, 0, 0, 6, 0],
+    [8, 0, 0, 0, 6, 0, 0, 0, 3],
+    [4, 0, 0, 8, 0, 3, 0, 0, 1],
+    [7, 0, 0, 0, 2, 0, 0, 0, 6],
+    [0, 6, 0, 0, 0, 0, 2, 8, 0],
+    [0, 0, 0, 4, 1, 9, 0, 0, 5],
+    [0, 0, 0, 0, 8, 0, 0, 7, 9],
+]
+
+# CORS headers for the single frontend origin, encoded once
+ALLOWED_ORIGIN = b"http://localhost:5173"  # Vite dev server
+CORS_HEADERS = [(b"access-control-allow-origin", ALLOWED_ORIGIN)]
+PREFLIGHT_HEADERS = CORS_HEADERS + [
+    (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+    (b"access-control-allow-headers", b"*"),
+    (b"access-control-max-age", b"600"),
+]
+
+class StaticCORSMiddleware:
+    """
+    ASGI middleware that adds constant CORS headers for ALLOWED_ORIGIN
+    and answers preflight requests with a fixed 204.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and any(
+            name == b"access-control-request-method" for name, _ in scope["headers"]
+        ):
+            await send({"type": "http.response.start", "status": 204, "headers": PREFLIGHT_HEADERS})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + CORS_HEADERS
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
 
 # Enable CORS for frontend communication
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],  # Vite dev server
-    allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(StaticCORSMiddleware)
 
 class SudokuGrid(BaseModel):
     grid: List[List[int]]
@@ -30,6 +97,55 @@ class SudokuResponse(BaseModel):
     success: bool
     message: str = ""
 
+def _to_ndarray(grid: List[List[int]]) -> np.ndarray:
+    """
+    Convert a 9x9 list grid to the flat int8 array the solver works on.
+    """
+    return np.array(grid, dtype=np.int8).reshape(-1)
+
+def _from_ndarray(arr: np.ndarray) -> np.ndarray:
+    """
+    Reshape a flat solver grid to 9x9 for the response.
+    orjson serialises numpy arrays directly, so no list conversion is needed.
+    """
+    return arr.reshape(9, 9)
+
+def _sudoku_response(grid, success: bool, message: str) -> ORJSONResponse:
+    """
+    Build a SudokuResponse-shaped reply that orjson serialises directly,
+    skipping response-model validation.
+    """
+    return ORJSONResponse({"grid": grid, "success": success, "message": message})
+
+async def _fill_puzzle_queue(queue: asyncio.Queue, difficulty: str):
+    """
+    Keep queue full of generated puzzles; put() waits while it is full,
+    so each puzzle taken by /generate is replaced automatically.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            puzzle = await loop.run_in_executor(PUZZLE_FILL_POOL, GENERATOR.generate_puzzle, difficulty)
+        except Exception:
+            # Keep the filler alive; /generate falls back to direct generation meanwhile
+            logger.exception("Background %s puzzle generation failed", difficulty)
+            await asyncio.sleep(PUZZLE_RETRY_DELAY)
+            continue
+        await queue.put(puzzle)
+
+@app.on_event("startup")
+async def start_puzzle_pool():
+    # Queues must be created on the running event loop
+    for difficulty in DIFFICULTIES:
+        queue = asyncio.Queue(maxsize=PUZZLE_POOL_SIZE)
+        PUZZLE_QUEUES[difficulty] = queue
+        PUZZLE_FILLERS.append(asyncio.create_task(_fill_puzzle_queue(queue, difficulty)))
+
+@app.on_event("shutdown")
+async def stop_puzzle_pool():
+    for task in PUZZLE_FILLERS:
+        task.cancel()
+
 @app.get("/")
 async def root():
     return {"message": "Sudoku API is running!"}
@@ -42,72 +158,52 @@ async def solve_sudoku(request: SudokuGrid):
     Input: 9x9 grid with 0s as blanks
     Output: Solved grid or error if unsolvable
     """
-    try:
-        # Validate grid size
-        if len(request.grid) != 9 or any(len(row) != 9 for row in request.grid):
-            raise HTTPException(status_code=400, detail="Grid must be 9x9")
-        
-        # Validate grid values
-        for row in request.grid:
-            for cell in row:
-                if not isinstance(cell, int) or cell < 0 or cell > 9:
-                    raise HTTPException(status_code=400, detail="Grid values must be integers between 0-9")
-        
-        solver = SudokuSolver()
-        
-        # Make a copy to avoid modifying the original
-        grid_copy = [row[:] for row in request.grid]
-        
-        if solver.solve(grid_copy):
-            return SudokuResponse(
-                grid=grid_copy,
-                success=True,
-                message="Sudoku solved successfully!"
-            )
-        else:
-            return SudokuResponse(
-                grid=request.grid,
-                success=False,
-                message="This Sudoku puzzle is unsolvable."
-            )
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error solving Sudoku: {str(e)}")
+    # Validate grid size
+    if len(request.grid) != 9 or any(len(row) != 9 for row in request.grid):
+        raise HTTPException(status_code=400, detail="Grid must be 9x9")
+    
+    # Validate grid values
+    for row in request.grid:
+        for cell in row:
+            if not isinstance(cell, int) or cell < 0 or cell > 9:
+                raise HTTPException(status_code=400, detail="Grid values must be integers between 0-9")
+    
+    # Convert to a fresh array so the original is left untouched
+    grid_array = _to_ndarray(request.grid)
+    
+    # Reject repeated digits up front instead of searching for nothing
+    masks = SOLVER.build_masks(grid_array)
+    if masks is None:
+        raise HTTPException(status_code=400, detail="Grid is inconsistent: a digit repeats in a row, column or box")
+    
+    # Unexpected solver errors propagate to FastAPI's default 500 handler
+    loop = asyncio.get_running_loop()
+    solved = await loop.run_in_executor(SOLVER_POOL, SOLVER.solve, grid_array, masks)
+
+    if solved:
+        return _sudoku_response(_from_ndarray(grid_array), True, "Sudoku solved successfully!")
+    else:
+        return _sudoku_response(request.grid, False, "This Sudoku puzzle is unsolvable.")
 
 @app.get("/generate", response_model=SudokuResponse)
 async def generate_sudoku():
     """
     Generate a valid random Sudoku puzzle with a unique solution.
     """
-    try:
-        generator = SudokuGenerator()
-        # Use quicker random difficulty path to reduce generation time/complexity
-        puzzle = generator.get_random_puzzle()
-
-        return SudokuResponse(
-            grid=puzzle,
-            success=True,
-            message="Random Sudoku puzzle generated successfully!"
-        )
-
-    except Exception:
-        # Fallback to a known-valid sample puzzle so the UI remains usable
-        sample_puzzle = [
-            [5, 3, 0, 0, 7, 0, 0, 0, 0],
-            [6, 0, 0, 1, 9, 5, 0, 0, 0],
-            [0, 9, 8, 0, 0, 0, 0, 6, 0],
-            [8, 0, 0, 0, 6, 0, 0, 0, 3],
-            [4, 0, 0, 8, 0, 3, 0, 0, 1],
-            [7, 0, 0, 0, 2, 0, 0, 0, 6],
-            [0, 6, 0, 0, 0, 0, 2, 8, 0],
-            [0, 0, 0, 4, 1, 9, 0, 0, 5],
-            [0, 0, 0, 0, 8, 0, 0, 7, 9],
-        ]
-        return SudokuResponse(
-            grid=sample_puzzle,
-            success=True,
-            message="Generated fallback puzzle."
-        )
+    # Serve a pre-generated puzzle, generating one directly if the pool is empty
+    difficulty = GENERATOR.random_difficulty()
+    queue = PUZZLE_QUEUES.get(difficulty)
+    if queue is not None and not queue.empty():
+        puzzle = queue.get_nowait()
+    else:
+        try:
+            loop = asyncio.get_running_loop()
+            puzzle = await loop.run_in_executor(SOLVER_POOL, GENERATOR.generate_puzzle, difficulty)
+        except Exception:
+            # Fallback to a known-valid sample puzzle so the UI remains usable
+            return _sudoku_response(FALLBACK_PUZZLE, True, "Generated fallback puzzle.")
+
+    return _sudoku_response(_from_ndarray(puzzle), True, "Random Sudoku puzzle generated successfully!")
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,107 +1,400 @@
+import threading
+
+import numpy as np
+
+from grid_tables import ROW_OF, COL_OF, BOX_OF, UNITS
+
+try:
+    import solver_numba
+except ImportError:
+    # Numba is optional; without it the dancing-links search is used
+    solver_numba = None
+
+
+class DLX:
+    """
+    An exact-cover matrix stored as Knuth's dancing links.
+
+    Node 0 is the root, nodes 1..n_columns are the column headers and every
+    following node is a 1 of the matrix. L/R/U/D are the circular links,
+    C maps a node to its column header and S holds the size of each column.
+    """
+
+    def __init__(self, n_columns: int, rows: list):
+        self.L = list(range(-1, n_columns))
+        self.R = list(range(1, n_columns + 2))
+        self.L[0] = n_columns
+        self.R[n_columns] = 0
+        self.U = list(range(n_columns + 1))
+        self.D = list(range(n_columns + 1))
+        self.C = list(range(n_columns + 1))
+        self.S = [0] * (n_columns + 1)
+        self.row_of = [-1] * (n_columns + 1)
+        self.row_start = []
+
+        for row_id, columns in enumerate(rows):
+            first = len(self.C)
+            self.row_start.append(first)
+            for k, col in enumerate(columns):
+                node = first + k
+                header = col + 1
+                # Append the node at the bottom of its column
+                self.U.append(self.U[header])
+                self.D.append(header)
+                self.D[self.U[header]] = node
+                self.U[header] = node
+                # Link it into its row
+                self.L.append(node - 1 if k else first + len(columns) - 1)
+                self.R.append(node + 1 if k < len(columns) - 1 else first)
+                self.C.append(header)
+                self.row_of.append(row_id)
+                self.S[header] += 1
+
+    def cover(self, c: int):
+        """
+        Remove column c from the header list and all its rows from the other columns.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, c: int):
+        """
+        Undo cover(c), restoring links in exactly the reverse order.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def select(self, r: int):
+        """
+        Cover the other columns of row node r after its own column was covered.
+        """
+        j = self.R[r]
+        while j != r:
+            self.cover(self.C[j])
+            j = self.R[j]
+
+    def unselect(self, r: int):
+        """
+        Undo select(r).
+        """
+        j = self.L[r]
+        while j != r:
+            self.uncover(self.C[j])
+            j = self.L[j]
+
+    def choose_column(self) -> int:
+        """
+        Return the column with the fewest remaining rows, or 0 if none are left.
+        """
+        R, S = self.R, self.S
+        c = R[0]
+        if c == 0:
+            return 0
+
+        best = S[c]
+        j = R[c]
+        while j != 0 and best > 1:
+            if S[j] < best:
+                c = j
+                best = S[j]
+            j = R[j]
+        return c
+
+    def search(self, solutions: list, limit: int):
+        """
+        Algorithm X with an explicit stack: append complete row selections to
+        solutions until limit is reached. The matrix is fully restored when this returns.
+        """
+        D, S = self.D, self.S
+        # Column covered and row node selected at each level
+        columns = []
+        rows = []
+
+        while True:
+            c = self.choose_column()
+            if c == 0:
+                solutions.append([self.row_of[r] for r in rows])
+                if len(solutions) >= limit:
+                    break
+            elif S[c] > 0:
+                # Descend: branch on the first row of the chosen column
+                self.cover(c)
+                r = D[c]
+                self.select(r)
+                columns.append(c)
+                rows.append(r)
+                continue
+
+            # Backtrack: move the deepest level on to its next row
+            while rows:
+                r = rows.pop()
+                self.unselect(r)
+                c = columns[-1]
+                r = D[r]
+                if r != c:
+                    self.select(r)
+                    rows.append(r)
+                    break
+                # Every row of this column was tried
+                columns.pop()
+                self.uncover(c)
+            else:
+                return
+
+        # Limit reached: unwind every level
+        while rows:
+            self.unselect(rows.pop())
+            self.uncover(columns.pop())
+
+
 class SudokuSolver:
     """
-    A Sudoku solver using backtracking algorithm.
+    A Sudoku solver using constraint propagation plus a compiled bitmask
+    search, falling back to Knuth's Algorithm X with dancing links when
+    Numba is not installed.
+
+    Grids are flat np.int8 arrays of length 81 in row-major order
+    (cell (row, col) is at index 9 * row + col), with 0 for blanks.
     """
-    
+
     def __init__(self):
         self.size = 9
         self.box_size = 3
-    
-    def is_valid(self, grid: list, row: int, col: int, num: int) -> bool:
-        """
-        Check if placing num at (row, col) is valid.
-        """
-        # Check row
-        for x in range(self.size):
-            if grid[row][x] == num:
-                return False
-        
-        # Check column
-        for x in range(self.size):
-            if grid[x][col] == num:
-                return False
-        
-        # Check 3x3 box
-        start_row = row - row % self.box_size
-        start_col = col - col % self.box_size
-        
-        for i in range(self.box_size):
-            for j in range(self.box_size):
-                if grid[i + start_row][j + start_col] == num:
+        self.cells = self.size * self.size
+        self.all_digits = (1 << self.size) - 1
+        self.dlx = DLX(4 * self.cells, self._exact_cover_rows())
+        # The DLX links are mutated while searching, so one search at a time
+        self.dlx_lock = threading.Lock()
+
+        if solver_numba is not None:
+            self._warmup()
+
+    def _warmup(self):
+        """
+        Load (or compile) the Numba kernels now so the first request doesn't pay for it.
+        """
+        empty = np.zeros(self.cells, dtype=np.int8)
+        self.count_solutions(empty, 1)
+        self.solve(empty)
+
+    def _exact_cover_rows(self) -> list:
+        """
+        Build the 729 candidate rows (row, col, digit) of the exact-cover matrix.
+        Each one covers a cell, a row-digit, a column-digit and a box-digit constraint.
+        """
+        n = self.size
+        rows = []
+        for row in range(n):
+            for col in range(n):
+                box = BOX_OF[row * n + col]
+                for d in range(n):
+                    rows.append((
+                        row * n + col,
+                        n * n + row * n + d,
+                        2 * n * n + col * n + d,
+                        3 * n * n + box * n + d,
+                    ))
+        return rows
+
+    def build_masks(self, grid: np.ndarray):
+        """
+        Build the row, column and box digit masks for grid in a single pass.
+        Bit d of a mask is set when digit d + 1 is present in that unit.
+        Returns None if a digit repeats within a unit.
+        """
+        row_mask = [0] * self.size
+        col_mask = [0] * self.size
+        box_mask = [0] * self.size
+
+        for idx, num in enumerate(grid.tolist()):
+            if num == 0:
+                continue
+
+            i, j, box = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+            bit = 1 << (num - 1)
+            if (row_mask[i] | col_mask[j] | box_mask[box]) & bit:
+                return None
+
+            row_mask[i] |= bit
+            col_mask[j] |= bit
+            box_mask[box] |= bit
+
+        return row_mask, col_mask, box_mask
+
+    def _mask_arrays(self, masks: tuple) -> tuple:
+        """
+        Convert row, column and box masks to the int32 arrays the Numba kernels take.
+        """
+        return tuple(np.array(mask, dtype=np.int32) for mask in masks)
+
+    def _propagate(self, cells: list, row_mask: list, col_mask: list, box_mask: list) -> bool:
+        """
+        Fill naked singles (cells with one candidate) and hidden singles (digits
+        with one possible cell in a unit) until nothing changes.
+        Updates the flat list of cells and the masks in place.
+        Returns False on a contradiction.
+        """
+        n = self.size
+        unit_masks = (row_mask, col_mask, box_mask)
+        dirty = set(range(3 * n))
+
+        while dirty:
+            pending = dirty
+            dirty = set()
+
+            for unit in pending:
+                seen_once = 0
+                seen_twice = 0
+                open_cells = []
+
+                for idx in UNITS[unit]:
+                    if cells[idx] != 0:
+                        continue
+
+                    i, j, box = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+                    free = self.all_digits & ~(row_mask[i] | col_mask[j] | box_mask[box])
+                    if free == 0:
+                        return False
+
+                    if free & (free - 1) == 0:
+                        # Naked single
+                        cells[idx] = free.bit_length()
+                        row_mask[i] |= free
+                        col_mask[j] |= free
+                        box_mask[box] |= free
+                        dirty.update((i, n + j, 2 * n + box))
+                        continue
+
+                    seen_twice |= seen_once & free
+                    seen_once |= free
+                    open_cells.append((idx, i, j, box))
+
+                placed = unit_masks[unit // n][unit % n]
+                if (seen_once | placed) != self.all_digits:
+                    # Some digit has nowhere left to go in this unit
                     return False
-        
+
+                hidden = seen_once & ~seen_twice & ~placed
+                while hidden:
+                    bit = hidden & -hidden
+                    hidden ^= bit
+                    for idx, i, j, box in open_cells:
+                        if cells[idx] != 0:
+                            continue
+                        if (row_mask[i] | col_mask[j] | box_mask[box]) & bit == 0:
+                            break
+                    else:
+                        # The only cell for this digit was taken or blocked meanwhile
+                        return False
+
+                    cells[idx] = bit.bit_length()
+                    row_mask[i] |= bit
+                    col_mask[j] |= bit
+                    box_mask[box] |= bit
+                    dirty.update((i, n + j, 2 * n + box))
+
         return True
-    
-    def find_empty_cell(self, grid: list) -> tuple:
+
+    def _search(self, cells: list, masks: tuple, limit: int) -> list:
         """
-        Find the first empty cell (value 0) in the grid.
-        Returns (row, col) if found, (-1, -1) if no empty cells.
+        Propagate forced digits into the flat list of cells, cover its givens,
+        run Algorithm X and restore the matrix. Returns up to limit solutions
+        as lists of selected row ids to apply on top of the propagated cells.
         """
-        for i in range(self.size):
-            for j in range(self.size):
-                if grid[i][j] == 0:
-                    return (i, j)
-        return (-1, -1)
-    
-    def solve(self, grid: list) -> bool:
+        if not self._propagate(cells, *masks):
+            return []
+
+        # Propagation alone often completes the grid. Otherwise every empty cell
+        # still has candidates, and DLX picks its own branching column.
+        if all(cells):
+            return [[]]
+
+        dlx = self.dlx
+        covered = []
+        solutions = []
+
+        with self.dlx_lock:
+            for idx, num in enumerate(cells):
+                if num == 0:
+                    continue
+
+                node = dlx.row_start[idx * self.size + num - 1]
+                for k in range(4):
+                    dlx.cover(dlx.C[node + k])
+                    covered.append(dlx.C[node + k])
+
+            dlx.search(solutions, limit)
+
+            for c in reversed(covered):
+                dlx.uncover(c)
+
+        return solutions
+
+    def solve(self, grid: np.ndarray, masks: tuple = None) -> bool:
         """
-        Solve the Sudoku puzzle using backtracking.
+        Solve the Sudoku puzzle.
         Returns True if solvable, False otherwise.
         Modifies the grid in place.
+        masks may pass in the result of build_masks(grid) to skip rebuilding it.
         """
-        row, col = self.find_empty_cell(grid)
-        
-        # If no empty cells, puzzle is solved
-        if row == -1:
-            return True
-        
-        # Try numbers 1-9
-        for num in range(1, 10):
-            if self.is_valid(grid, row, col, num):
-                grid[row][col] = num
-                
-                # Recursively solve the rest
-                if self.solve(grid):
-                    return True
-                
-                # Backtrack if this path doesn't lead to a solution
-                grid[row][col] = 0
-        
-        return False
-    
-    def is_solvable(self, grid: list) -> bool:
+        if masks is None:
+            masks = self.build_masks(grid)
+        if masks is None:
+            return False
+
+        if solver_numba is not None:
+            return solver_numba.solve_nb(grid, *self._mask_arrays(masks))
+
+        # Work on a copy so an unsolvable grid is left untouched
+        cells = grid.tolist()
+        solutions = self._search(cells, masks, 1)
+        if not solutions:
+            return False
+
+        for row_id in solutions[0]:
+            idx, d = divmod(row_id, self.size)
+            cells[idx] = d + 1
+
+        grid[:] = cells
+        return True
+
+    def is_solvable(self, grid: np.ndarray) -> bool:
         """
         Check if a Sudoku puzzle is solvable without modifying the original grid.
         """
         # Make a copy to avoid modifying the original
-        grid_copy = [row[:] for row in grid]
-        return self.solve(grid_copy)
-    
-    def count_solutions(self, grid: list, limit: int = 2) -> int:
+        return self.solve(grid.copy())
+
+    def count_solutions(self, grid: np.ndarray, limit: int = 2) -> int:
         """
         Count the number of solutions for a Sudoku puzzle.
         Returns the count up to the limit (useful for checking uniqueness).
         """
-        grid_copy = [row[:] for row in grid]
-        return self._count_solutions_recursive(grid_copy, limit)
-    
-    def _count_solutions_recursive(self, grid: list, limit: int) -> int:
-        """
-        Recursive helper for counting solutions.
-        """
-        row, col = self.find_empty_cell(grid)
-        
-        if row == -1:
-            return 1
-        
-        count = 0
-        for num in range(1, 10):
-            if self.is_valid(grid, row, col, num):
-                grid[row][col] = num
-                count += self._count_solutions_recursive(grid, limit)
-                grid[row][col] = 0
-                
-                if count >= limit:
-                    return count
-        
-        return count
+        masks = self.build_masks(grid)
+        if masks is None:
+            return 0
+
+        if solver_numba is not None:
+            return solver_numba.count_nb(grid, *self._mask_arrays(masks), limit)
+
+        return len(self._search(grid.tolist(), masks, limit))
@@ -0,0 +1,208 @@
+import numpy as np
+from numba import njit
+
+import grid_tables
+
+# Compiled search kernels for SudokuSolver.
+#
+# Grids are flat int8 arrays of length 81 (cell (row, col) at 9 * row + col)
+# with 0 for blanks. Masks are int32 arrays of length 9 where bit d is set
+# when digit d + 1 is placed in that row, column or box.
+
+ALL_DIGITS = 0x1FF
+
+# Number of set bits for every 9-bit digit mask
+POPCOUNT = np.array([bin(mask).count("1") for mask in range(1 << 9)], dtype=np.int8)
+
+# Digit encoded by each single-bit mask (its trailing-zero count + 1); a table
+# lookup avoids a shift loop per placement
+DIGIT_OF = np.array([mask.bit_length() for mask in range(1 << 9)], dtype=np.int8)
+
+# The shared index tables as arrays the kernels can read
+ROW_OF = np.array(grid_tables.ROW_OF, dtype=np.int8)
+COL_OF = np.array(grid_tables.COL_OF, dtype=np.int8)
+BOX_OF = np.array(grid_tables.BOX_OF, dtype=np.int8)
+UNIT_CELLS = np.array(grid_tables.UNITS, dtype=np.int8)
+
+
+@njit(cache=True, nogil=True)
+def _digit(bit):
+    """
+    Digit (1-9) encoded by a single-bit mask.
+    """
+    return DIGIT_OF[bit]
+
+
+@njit(cache=True, nogil=True)
+def _place(grid, rm, cm, bm, idx, bit):
+    """
+    Write the digit for bit at cell idx and mark it in the unit masks.
+    """
+    grid[idx] = _digit(bit)
+    rm[ROW_OF[idx]] |= bit
+    cm[COL_OF[idx]] |= bit
+    bm[BOX_OF[idx]] |= bit
+
+
+@njit(cache=True, nogil=True)
+def _free(rm, cm, bm, idx):
+    """
+    Mask of the digits still free at cell idx.
+    """
+    return ALL_DIGITS & ~(rm[ROW_OF[idx]] | cm[COL_OF[idx]] | bm[BOX_OF[idx]])
+
+
+@njit(cache=True, nogil=True, inline="always")
+def _propagate_select_nb(grid, rm, cm, bm):
+    """
+    Fill naked and hidden singles until nothing changes, then pick the empty
+    cell with the fewest candidates. The naked-single sweep already computes
+    every cell's candidates, so the final sweep doubles as the branching scan.
+    Returns (idx, candidates): idx is -1 if the grid is full and -2 on a
+    contradiction.
+    """
+    while True:
+        changed = False
+        best_idx = -1
+        best_free = 0
+        best_count = 10
+
+        # Naked singles: cells with exactly one candidate digit
+        for idx in range(81):
+            if grid[idx] != 0:
+                continue
+            free = _free(rm, cm, bm, idx)
+            if free == 0:
+                return -2, 0
+            if free & (free - 1) == 0:
+                _place(grid, rm, cm, bm, idx, free)
+                changed = True
+            elif not changed and best_count > 2:
+                # Only meaningful while the masks are unchanged by this sweep;
+                # two is the minimum once singles are gone
+                count = POPCOUNT[free]
+                if count < best_count:
+                    best_idx = idx
+                    best_free = free
+                    best_count = count
+
+        # Hidden singles: digits with one possible cell in a unit
+        for unit in range(27):
+            seen_once = 0
+            seen_twice = 0
+            for k in range(9):
+                idx = UNIT_CELLS[unit, k]
+                if grid[idx] != 0:
+                    continue
+                free = _free(rm, cm, bm, idx)
+                seen_twice |= seen_once & free
+                seen_once |= free
+
+            if unit < 9:
+                placed = rm[unit]
+            elif unit < 18:
+                placed = cm[unit - 9]
+            else:
+                placed = bm[unit - 18]
+
+            if (seen_once | placed) != ALL_DIGITS:
+                return -2, 0
+
+            hidden = seen_once & ~seen_twice & ~placed
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                found = False
+                for k in range(9):
+                    idx = UNIT_CELLS[unit, k]
+                    if grid[idx] == 0 and _free(rm, cm, bm, idx) & bit:
+                        _place(grid, rm, cm, bm, idx, bit)
+                        found = True
+                        break
+                if not found:
+                    return -2, 0
+                changed = True
+
+        if not changed:
+            return best_idx, best_free
+
+
+@njit(cache=True, nogil=True)
+def _search_nb(grid, rm, cm, bm, limit, out):
+    """
+    Depth-first search with an explicit stack: propagate, then branch on the
+    most constrained cell, both in the inlined _propagate_select_nb. Level d
+    of the stack holds the grid and masks at that depth, the branching cell
+    and the candidates not yet tried.
+    Returns the number of solutions found up to limit; the first is copied to out.
+    """
+    # Every level fills at least one cell, so 82 levels always suffice
+    grids = np.empty((82, 81), dtype=grid.dtype)
+    rms = np.empty((82, 9), dtype=rm.dtype)
+    cms = np.empty((82, 9), dtype=cm.dtype)
+    bms = np.empty((82, 9), dtype=bm.dtype)
+    cells = np.empty(82, dtype=np.int32)
+    pending = np.zeros(82, dtype=np.int32)
+
+    grids[0] = grid
+    rms[0] = rm
+    cms[0] = cm
+    bms[0] = bm
+
+    count = 0
+    depth = 0
+    descend = True
+    while depth >= 0:
+        if descend:
+            descend = False
+            pending[depth] = 0
+            idx, free = _propagate_select_nb(grids[depth], rms[depth], cms[depth], bms[depth])
+            if idx == -1:
+                count += 1
+                if out[0] == 0:
+                    out[:] = grids[depth]
+                if count >= limit:
+                    return count
+            elif idx >= 0:
+                cells[depth] = idx
+                pending[depth] = free
+
+        free = pending[depth]
+        if free == 0:
+            # Dead end, solution or exhausted candidates: backtrack
+            depth -= 1
+            continue
+
+        bit = free & -free
+        pending[depth] = free ^ bit
+
+        grids[depth + 1] = grids[depth]
+        rms[depth + 1] = rms[depth]
+        cms[depth + 1] = cms[depth]
+        bms[depth + 1] = bms[depth]
+        _place(grids[depth + 1], rms[depth + 1], cms[depth + 1], bms[depth + 1], cells[depth], bit)
+        depth += 1
+        descend = True
+
+    return count
+
+
+@njit(cache=True, nogil=True)
+def solve_nb(grid, rm, cm, bm):
+    """
+    Solve grid in place. Returns True if solvable.
+    """
+    out = np.zeros_like(grid)
+    if _search_nb(grid, rm, cm, bm, 1, out) == 0:
+        return False
+    grid[:] = out
+    return True
+
+
+@njit(cache=True, nogil=True)
+def count_nb(grid, rm, cm, bm, limit):
+    """
+    Count solutions of grid up to limit.
+    """
+    out = np.zeros_like(grid)
+    return _search_nb(grid, rm, cm, bm, limit, out)
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Import the backend modules the same way main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import solver as solver_module
+from solver import SudokuSolver
+
+# A classic puzzle with a unique solution
+PUZZLE = [
+    [5, 3, 0, 0, 7, 0, 0, 0, 0],
+    [6, 0, 0, 1, 9, 5, 0, 0, 0],
+    [0, 9, 8, 0, 0, 0, 0, 6, 0],
+    [8, 0, 0, 0, 6, 0, 0, 0, 3],
+    [4, 0, 0, 8, 0, 3, 0, 0, 1],
+    [7, 0, 0, 0, 2, 0, 0, 0, 6],
+    [0, 6, 0, 0, 0, 0, 2, 8, 0],
+    [0, 0, 0, 4, 1, 9, 0, 0, 5],
+    [0, 0, 0, 0, 8, 0, 0, 7, 9],
+]
+
+# A puzzle that propagation alone cannot finish, so the search has to branch
+HARD_PUZZLE = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+def to_array(grid) -> np.ndarray:
+    """
+    Convert a 9x9 list grid or an 81-character string to a flat int8 array.
+    """
+    if isinstance(grid, str):
+        return np.array([int(c) for c in grid], dtype=np.int8)
+    return np.array(grid, dtype=np.int8).reshape(-1)
+
+
+def is_complete_solution(grid: np.ndarray) -> bool:
+    """
+    Check that every row, column and box of a flat grid holds the digits 1-9.
+    """
+    board = grid.reshape(9, 9)
+    digits = list(range(1, 10))
+    for i in range(9):
+        box = board[3 * (i // 3):3 * (i // 3) + 3, 3 * (i % 3):3 * (i % 3) + 3]
+        if sorted(board[i]) != digits or sorted(board[:, i]) != digits or sorted(box.ravel()) != digits:
+            return False
+    return True
+
+
+@pytest.fixture(params=["numba", "dlx"])
+def solver(request, monkeypatch):
+    """
+    A SudokuSolver on the Numba kernels, and one on the dancing-links fallback.
+    """
+    if request.param == "numba":
+        if solver_module.solver_numba is None:
+            pytest.skip("Numba is not installed")
+    else:
+        monkeypatch.setattr(solver_module, "solver_numba", None)
+    return SudokuSolver()
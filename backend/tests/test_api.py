@@ -0,0 +1,152 @@
+import json
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from conftest import PUZZLE, is_complete_solution, to_array
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def live_client():
+    # Entering the client runs the startup and shutdown events
+    with TestClient(main.app) as client:
+        yield client
+
+
+def wait_for_puzzle_pools(timeout: float = 10.0):
+    """
+    Wait until every difficulty's pool holds at least one puzzle.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if main.PUZZLE_QUEUES and all(queue.qsize() for queue in main.PUZZLE_QUEUES.values()):
+            return
+        time.sleep(0.01)
+    pytest.fail("Puzzle pools were not filled in time")
+
+
+def test_solve(client):
+    response = client.post("/solve", json={"grid": PUZZLE})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"]
+    assert is_complete_solution(to_array(body["grid"]))
+
+
+def test_response_serialises_ndarray_grid():
+    grid = np.arange(81, dtype=np.int8) % 10
+    response = main._sudoku_response(main._from_ndarray(grid), True, "ok")
+
+    body = json.loads(response.body)
+    assert body == {"grid": grid.reshape(9, 9).tolist(), "success": True, "message": "ok"}
+
+
+def test_solve_returns_plain_int_grid(client):
+    response = client.post("/solve", json={"grid": PUZZLE})
+    grid = response.json()["grid"]
+    assert len(grid) == 9
+    assert all(len(row) == 9 and all(type(cell) is int for cell in row) for row in grid)
+
+
+def test_solve_rejects_wrong_size(client):
+    response = client.post("/solve", json={"grid": PUZZLE[:8]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Grid must be 9x9"
+
+    grid = [row[:] for row in PUZZLE]
+    grid[4] = grid[4][:8]
+    response = client.post("/solve", json={"grid": grid})
+    assert response.status_code == 400
+
+
+def test_solve_rejects_out_of_range_values(client):
+    for value in (10, -1):
+        grid = [row[:] for row in PUZZLE]
+        grid[0][2] = value
+        response = client.post("/solve", json={"grid": grid})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Grid values must be integers between 0-9"
+
+
+def test_solve_rejects_inconsistent_grid(client):
+    grid = [row[:] for row in PUZZLE]
+    grid[0][2] = 5
+    response = client.post("/solve", json={"grid": grid})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Grid is inconsistent")
+
+
+def test_cors_preflight(client):
+    response = client.options(
+        "/solve",
+        headers={"Origin": "http://localhost:5173", "Access-Control-Request-Method": "POST"},
+    )
+    assert response.status_code == 204
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert "POST" in response.headers["access-control-allow-methods"]
+
+
+def test_cors_headers_on_responses(client):
+    response = client.get("/", headers={"Origin": "http://localhost:5173"})
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+
+    # Error responses carry the header too, so the frontend can read them
+    response = client.post("/solve", json={"grid": PUZZLE[:8]})
+    assert response.status_code == 400
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+
+
+def test_generate_serves_pooled_puzzles(live_client):
+    wait_for_puzzle_pools()
+
+    for _ in range(5):
+        response = live_client.get("/generate")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["success"]
+        assert body["message"] == "Random Sudoku puzzle generated successfully!"
+        assert main.SOLVER.count_solutions(to_array(body["grid"]), limit=2) == 1
+
+
+def test_puzzle_filler_recovers_from_errors(monkeypatch, caplog):
+    generate_puzzle = main.GENERATOR.generate_puzzle
+    failures = []
+
+    def flaky_generate(difficulty):
+        if len(failures) < 3:
+            failures.append(difficulty)
+            raise RuntimeError("generation failed")
+        return generate_puzzle(difficulty)
+
+    monkeypatch.setattr(main.GENERATOR, "generate_puzzle", flaky_generate)
+    monkeypatch.setattr(main, "PUZZLE_RETRY_DELAY", 0.01)
+
+    with TestClient(main.app):
+        wait_for_puzzle_pools()
+
+    assert len(failures) == 3
+    assert "puzzle generation failed" in caplog.text
+
+
+def test_generate_falls_back_when_generation_fails(client, monkeypatch):
+    def failing_generate(difficulty):
+        raise RuntimeError("generation failed")
+
+    # With no pooled puzzles, /generate has to generate directly
+    monkeypatch.setattr(main, "PUZZLE_QUEUES", {})
+    monkeypatch.setattr(main.GENERATOR, "generate_puzzle", failing_generate)
+
+    response = client.get("/generate")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["grid"] == main.FALLBACK_PUZZLE
+    assert body["message"] == "Generated fallback puzzle."
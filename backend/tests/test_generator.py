@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from generator import DIFFICULTIES, SudokuGenerator
+from conftest import is_complete_solution
+
+# Blank-count range for each difficulty, as set in generate_puzzle
+BLANKS = {"easy": (35, 45), "medium": (46, 55), "hard": (56, 64)}
+
+
+@pytest.fixture
+def generator(solver):
+    generator = SudokuGenerator(solver=solver)
+    # Seed the generator so blank counts are reproducible
+    generator._rng = np.random.default_rng(2024)
+    return generator
+
+
+def test_complete_grid_is_valid(generator):
+    assert is_complete_solution(generator.generate_complete_sudoku())
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_puzzle_has_unique_solution(generator, difficulty):
+    low, high = BLANKS[difficulty]
+    for _ in range(10):
+        puzzle = generator.generate_puzzle(difficulty)
+        blanks = (puzzle == 0).sum()
+
+        assert puzzle.shape == (81,)
+        assert generator.solver.count_solutions(puzzle, limit=2) == 1
+        assert blanks <= high
+        # Hard targets can exceed what uniqueness allows, so only easy and
+        # medium puzzles must always reach their minimum
+        if difficulty != "hard":
+            assert blanks >= low
@@ -0,0 +1,56 @@
+import numpy as np
+
+from conftest import HARD_PUZZLE, PUZZLE, is_complete_solution, to_array
+
+
+def test_solves_unique_puzzle(solver):
+    for puzzle in (PUZZLE, HARD_PUZZLE):
+        grid = to_array(puzzle)
+        givens = grid.copy()
+
+        assert solver.solve(grid)
+        assert is_complete_solution(grid)
+        assert np.all((givens == 0) | (grid == givens))
+
+
+def test_counts_unique_puzzle_once(solver):
+    assert solver.count_solutions(to_array(PUZZLE)) == 1
+    assert solver.count_solutions(to_array(HARD_PUZZLE)) == 1
+
+
+def test_multiple_solutions(solver):
+    # Only the top three rows of givens leave the puzzle wide open
+    grid = to_array(PUZZLE)
+    grid[27:] = 0
+    assert solver.count_solutions(grid, limit=2) == 2
+    assert solver.solve(grid)
+    assert is_complete_solution(grid)
+
+    empty = np.zeros(81, dtype=np.int8)
+    assert solver.count_solutions(empty, limit=5) == 5
+    assert solver.solve(empty)
+    assert is_complete_solution(empty)
+
+
+def test_unsolvable_puzzle(solver):
+    # Consistent givens, but cell (0, 8) can only hold 9 and 9 is already in column 8
+    grid = np.zeros(81, dtype=np.int8)
+    grid[:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+    grid[17] = 9
+    original = grid.copy()
+
+    assert not solver.solve(grid)
+    assert np.array_equal(grid, original)
+    assert solver.count_solutions(grid) == 0
+
+
+def test_inconsistent_puzzle(solver):
+    grid = to_array(PUZZLE)
+    grid[2] = 5  # 5 already sits at (0, 0)
+    original = grid.copy()
+
+    assert solver.build_masks(grid) is None
+    assert not solver.solve(grid)
+    assert np.array_equal(grid, original)
+    assert solver.count_solutions(grid) == 0
+